@@ -1,13 +1,30 @@
 import sys
 import os
 import json
+import re
+import asyncio
+import threading
+import unicodedata
+import mmap
+import time
+import multiprocessing
+import cProfile
+import pstats
 import requests
-from dataclasses import dataclass
-from typing import Optional, Tuple
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Tuple
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse, sre_constants
 
 # --- Dependencias de UI ---
 # PySide6 base + Addons (WebEngine)
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QEvent, QSize
+from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QEvent, QSize, QTimer, QObject, Signal, QRunnable, QThreadPool
 from PySide6.QtGui import QFont, QAction
 from PySide6.QtWidgets import (
     QApplication,
@@ -23,12 +40,17 @@ from PySide6.QtWidgets import (
     QFileDialog,
     QGraphicsDropShadowEffect,
     QMessageBox,
+    QDockWidget,
+    QInputDialog,
 )
 from PySide6.QtWebEngineWidgets import QWebEngineView
 
 # --- Analítica telefónica ---
 import phonenumbers
 from phonenumbers import geocoder as pn_geocoder, carrier as pn_carrier, timezone as pn_timezone, NumberParseException
+from phonenumbers import COUNTRY_CODE_TO_REGION_CODE, PhoneMetadata, country_mobile_token
+from phonenumbers.carrierdata import CARRIER_DATA
+from phonenumbers.geodata import GEOCODE_DATA
 
 APP_TITLE = "InfoPhone Pro"
 WINDOW_W, WINDOW_H = 1444, 800
@@ -136,6 +158,751 @@ class PhoneInfo:
     timezones: list
     centroid: Optional[Tuple[float, float]]
 
+# ============================
+#   INSTRUMENTACIÓN (opcional: INFOPHONE_PERF=1 o menú "Rendimiento")
+# ============================
+# Fases en el orden en que se muestran en el panel
+PERF_PHASES = (
+    "parse", "validacion", "operador", "geocoder", "zona_horaria",
+    "formato_html", "terminal_log", "js_update", "js_ida_vuelta",
+)
+PERF_WINDOW = 500
+_NO_PHASE = nullcontext()
+
+class PhaseTimer:
+    """Cronómetro por fases con ventanas móviles de muestras y cProfile a demanda"""
+
+    def __init__(self, window: int = PERF_WINDOW):
+        self.enabled = bool(os.environ.get("INFOPHONE_PERF"))
+        self.window = window
+        self.samples = {}
+        self._stack = []
+        self._current = None
+        self._owner = None
+        self._profiler = None
+
+    def phase(self, name: str):
+        # Solo se mide dentro de operation() y en su hilo; lotes, rangos y logs sueltos no ensucian las muestras.
+        # Desactivado devuelve un contexto vacío compartido para no penalizar analyze_number en lotes.
+        if self.enabled and self._current is not None and threading.get_ident() == self._owner:
+            return self._timed_phase(name)
+        return _NO_PHASE
+
+    @contextmanager
+    def _timed_phase(self, name: str):
+        # Tiempo exclusivo: se descuenta lo que consumen las fases anidadas
+        children = [0.0]
+        self._stack.append(children)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += elapsed
+            self._add(name, elapsed - children[0])
+
+    @contextmanager
+    def operation(self):
+        """Agrupa las fases de una operación para registrar una sola muestra por fase"""
+        if not self.enabled or self._current is not None:
+            yield
+            return
+        self._current = {}
+        self._owner = threading.get_ident()
+        try:
+            yield
+        finally:
+            current, self._current = self._current, None
+            self._owner = None
+            for name, secs in current.items():
+                self.record(name, secs)
+
+    def _add(self, name: str, secs: float):
+        self._current[name] = self._current.get(name, 0.0) + secs
+
+    def record(self, name: str, secs: float):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(secs)
+
+    def percentiles(self) -> list:
+        """Devuelve (fase, muestras, p50 ms, p95 ms) para cada fase con datos"""
+        names = [n for n in PERF_PHASES if n in self.samples]
+        names += sorted(n for n in self.samples if n not in PERF_PHASES)
+        rows = []
+        for name in names:
+            data = sorted(self.samples[name])
+            if not data:
+                continue
+            p50 = data[int(0.50 * (len(data) - 1))]
+            p95 = data[int(0.95 * (len(data) - 1))]
+            rows.append((name, len(data), p50 * 1000, p95 * 1000))
+        return rows
+
+    def reset(self):
+        self.samples.clear()
+
+    @property
+    def profiling(self) -> bool:
+        return self._profiler is not None
+
+    def start_profile(self):
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop_profile(self, path: Optional[str] = None) -> Optional[pstats.Stats]:
+        """Detiene cProfile y, si se indica ruta, vuelca las estadísticas en formato pstats"""
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return None
+        profiler.disable()
+        if path:
+            profiler.dump_stats(path)
+        return pstats.Stats(profiler)
+
+PERF = PhaseTimer()
+
+# ============================
+#   ANÁLISIS (independiente de la UI)
+# ============================
+def analyze_number(raw: str) -> PhoneInfo:
+    raw = raw.strip()
+    if not raw:
+        raise ValueError("Número vacío")
+    try:
+        with PERF.phase("parse"):
+            num = phonenumbers.parse(raw, None)
+    except NumberParseException as e:
+        raise ValueError(f"No se pudo interpretar el número: {e}")
+
+    with PERF.phase("validacion"):
+        # Análisis completo y detallado
+        is_possible = phonenumbers.is_possible_number(num)
+        is_valid = phonenumbers.is_valid_number(num)
+        valid = is_possible and is_valid
+
+        # Formatos múltiples
+        e164 = phonenumbers.format_number(num, phonenumbers.PhoneNumberFormat.E164) if valid else None
+        national = phonenumbers.format_number(num, phonenumbers.PhoneNumberFormat.NATIONAL) if valid else None
+        international = phonenumbers.format_number(num, phonenumbers.PhoneNumberFormat.INTERNATIONAL) if valid else None
+
+        # Información geográfica detallada
+        region = phonenumbers.region_code_for_number(num) or "UNKNOWN"
+        ntype = phonenumbers.number_type(num)
+        number_type_str = TYPE_NAMES.get(ntype, str(ntype))
+
+    with PERF.phase("operador"):
+        # Operadores múltiples idiomas
+        carrier_es = pn_carrier.name_for_number(num, "es")
+        carrier_en = pn_carrier.name_for_number(num, "en")
+        carrier = carrier_es or carrier_en or "No disponible"
+
+    with PERF.phase("geocoder"):
+        # Descripciones geográficas múltiples
+        desc_es = pn_geocoder.description_for_number(num, "es")
+        desc_en = pn_geocoder.description_for_number(num, "en")
+        description = desc_es or desc_en or "Ubicación no disponible"
+
+    with PERF.phase("zona_horaria"):
+        # Zonas horarias
+        tzs = list(pn_timezone.time_zones_for_number(num)) or []
+
+    # Coordenadas mejoradas
+    centroid = COUNTRY_CENTROIDS.get(region, (0.0, 0.0))
+
+    return PhoneInfo(
+        raw=raw,
+        e164=e164,
+        region=region,
+        valid=bool(valid),
+        number_type=number_type_str,
+        carrier=carrier,
+        description=description,
+        timezones=tzs,
+        centroid=centroid,
+    )
+
+
+# ============================
+#   ANÁLISIS POR LOTES (archivos grandes vía mmap)
+# ============================
+# Tamaño objetivo de cada bloque; se ajusta al siguiente salto de línea.
+BATCH_CHUNK_BYTES = 32 * 1024 * 1024
+
+@dataclass
+class BatchStats:
+    numbers: int = 0
+    valid: int = 0
+    invalid: int = 0
+    errors: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    regions: Counter = field(default_factory=Counter)
+    types: Counter = field(default_factory=Counter)
+
+    def merge(self, other: 'BatchStats'):
+        self.numbers += other.numbers
+        self.valid += other.valid
+        self.invalid += other.invalid
+        self.errors += other.errors
+        self.bytes += other.bytes
+        self.regions.update(other.regions)
+        self.types.update(other.types)
+
+    @property
+    def numbers_per_sec(self) -> float:
+        return self.numbers / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def bytes_per_sec(self) -> float:
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+def analyze_batch(raws: Iterable[str], stats: Optional[BatchStats] = None) -> BatchStats:
+    """Versión por lotes de analyze_number: acumula conteos en lugar de guardar cada resultado"""
+    stats = stats if stats is not None else BatchStats()
+    for raw in raws:
+        if not raw.strip():
+            continue
+        stats.numbers += 1
+        try:
+            info = analyze_number(raw)
+        except ValueError:
+            stats.errors += 1
+            continue
+        if info.valid:
+            stats.valid += 1
+        else:
+            stats.invalid += 1
+        stats.regions[info.region] += 1
+        stats.types[info.number_type] += 1
+    return stats
+
+def chunk_offsets(mm, chunk_bytes: int = BATCH_CHUNK_BYTES) -> list:
+    """Divide el archivo mapeado en rangos (inicio, fin) que terminan en salto de línea"""
+    size = len(mm)
+    offsets = []
+    start = 0
+    while start < size:
+        end = min(start + chunk_bytes, size)
+        if end < size:
+            nl = mm.find(b"\n", end - 1)
+            end = size if nl == -1 else nl + 1
+        offsets.append((start, end))
+        start = end
+    return offsets
+
+def _iter_lines(mm, start: int, end: int):
+    pos = start
+    while pos < end:
+        nl = mm.find(b"\n", pos, end)
+        if nl == -1:
+            nl = end
+        yield mm[pos:nl].decode("utf-8", errors="ignore")
+        pos = nl + 1
+
+# Cada proceso trabajador mapea el archivo una sola vez
+_worker_file = None
+_worker_mm = None
+
+def _init_batch_worker(path: str):
+    global _worker_file, _worker_mm
+    _worker_file = open(path, "rb")
+    _worker_mm = mmap.mmap(_worker_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _analyze_chunk(offsets: Tuple[int, int]) -> BatchStats:
+    start, end = offsets
+    stats = analyze_batch(_iter_lines(_worker_mm, start, end))
+    stats.bytes = end - start
+    return stats
+
+def analyze_file(path: str, workers: Optional[int] = None, chunk_bytes: int = BATCH_CHUNK_BYTES) -> BatchStats:
+    """Analiza un archivo con un número por línea repartiendo rangos de bytes entre procesos"""
+    t0 = time.perf_counter()
+    total = BatchStats()
+    if os.path.getsize(path) == 0:
+        return total
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        offsets = chunk_offsets(mm, chunk_bytes)
+        workers = min(workers or os.cpu_count() or 1, len(offsets))
+        if workers <= 1:
+            for start, end in offsets:
+                stats = analyze_batch(_iter_lines(mm, start, end))
+                stats.bytes = end - start
+                total.merge(stats)
+        else:
+            # Solo viajan los desplazamientos; cada trabajador lee del mismo mapeo
+            with multiprocessing.Pool(workers, initializer=_init_batch_worker, initargs=(path,)) as pool:
+                for stats in pool.imap_unordered(_analyze_chunk, offsets):
+                    total.merge(stats)
+    total.seconds = time.perf_counter() - t0
+    return total
+
+# ============================
+#   ANÁLISIS POR RANGOS DE PREFIJO (bloques de numeración)
+# ============================
+# Filas de la tabla de rango que se escriben en la terminal
+RANGE_MAX_LOG_ROWS = 200
+DIGITS = "0123456789"
+_NUMBER_DESCS = (
+    "general_desc", "fixed_line", "mobile", "toll_free", "premium_rate", "shared_cost",
+    "voip", "personal_number", "pager", "uan", "voicemail",
+)
+
+@dataclass
+class RangeRow:
+    prefix: str
+    count: int
+    valid: bool
+    number_type: Optional[str]
+    carrier: Optional[str]
+    description: Optional[str]
+
+@dataclass
+class RangeReport:
+    prefix: str
+    length: int
+    total: int
+    rows: list
+    seconds: float = 0.0
+
+    def by_carrier(self) -> Counter:
+        totals = Counter()
+        for row in self.rows:
+            totals[row.carrier] += row.count
+        return totals
+
+    def by_type(self) -> Counter:
+        totals = Counter()
+        for row in self.rows:
+            totals[row.number_type if row.valid else None] += row.count
+        return totals
+
+class _DigitAutomaton:
+    """Autómata sobre dígitos para un patrón de metadatos (national_number_pattern o leading_digits)"""
+
+    def __init__(self, pattern: str, prefix_match: bool = False):
+        self._edges = []
+        self._eps = []
+        start = self._new()
+        self._accept = self._build(sre_parse.parse(pattern), start)
+        if prefix_match:
+            # leading_digits se evalúa con re.match: basta con casar el inicio
+            self._edges[self._accept].append((frozenset(DIGITS), self._accept))
+        self._ids = {}
+        self._sets = []
+        self._trans = {}
+        self.dead = self._intern(frozenset())
+        self.start = self._intern(self._closure({start}))
+
+    def _new(self) -> int:
+        self._edges.append([])
+        self._eps.append([])
+        return len(self._edges) - 1
+
+    def _chars(self, op, av) -> frozenset:
+        if op is sre_constants.LITERAL:
+            return frozenset(chr(av))
+        if op is sre_constants.NOT_LITERAL:
+            return frozenset(DIGITS) - {chr(av)}
+        if op is sre_constants.ANY:
+            return frozenset(DIGITS)
+        chars, negate = set(), False
+        for item, value in av:
+            if item is sre_constants.NEGATE:
+                negate = True
+            elif item is sre_constants.LITERAL:
+                chars.add(chr(value))
+            elif item is sre_constants.RANGE:
+                chars.update(chr(c) for c in range(value[0], value[1] + 1))
+            elif item is sre_constants.CATEGORY and value is sre_constants.CATEGORY_DIGIT:
+                chars.update(DIGITS)
+            else:
+                raise ValueError(f"Clase no soportada en patrón de metadatos: {item}")
+        chars &= set(DIGITS)
+        return frozenset(DIGITS) - chars if negate else frozenset(chars)
+
+    def _build(self, items, state: int) -> int:
+        for op, av in items:
+            if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN):
+                nxt = self._new()
+                self._edges[state].append((self._chars(op, av), nxt))
+                state = nxt
+            elif op is sre_constants.SUBPATTERN:
+                state = self._build(av[-1], state)
+            elif op is sre_constants.BRANCH:
+                end = self._new()
+                for branch in av[1]:
+                    begin = self._new()
+                    self._eps[state].append(begin)
+                    self._eps[self._build(branch, begin)].append(end)
+                state = end
+            elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+                low, high, sub = av
+                for _ in range(low):
+                    state = self._build(sub, state)
+                if high is sre_constants.MAXREPEAT:
+                    loop = self._new()
+                    self._eps[state].append(loop)
+                    self._eps[self._build(sub, loop)].append(loop)
+                    state = loop
+                else:
+                    for _ in range(high - low):
+                        end = self._new()
+                        self._eps[state].append(end)
+                        self._eps[self._build(sub, state)].append(end)
+                        state = end
+            elif op is sre_constants.AT:
+                continue
+            else:
+                raise ValueError(f"Operador no soportado en patrón de metadatos: {op}")
+        return state
+
+    def _closure(self, states) -> frozenset:
+        stack, seen = list(states), set(states)
+        while stack:
+            for nxt in self._eps[stack.pop()]:
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return frozenset(seen)
+
+    def _intern(self, states: frozenset) -> int:
+        ident = self._ids.get(states)
+        if ident is None:
+            ident = self._ids[states] = len(self._sets)
+            self._sets.append(states)
+        return ident
+
+    def step(self, ident: int, digit: str) -> int:
+        key = (ident, digit)
+        nxt = self._trans.get(key)
+        if nxt is None:
+            moved = {t for s in self._sets[ident] for chars, t in self._edges[s] if digit in chars}
+            nxt = self._trans[key] = self._intern(self._closure(moved))
+        return nxt
+
+    def accepts(self, ident: int) -> bool:
+        return self._accept in self._sets[ident]
+
+class _PrefixWalker:
+    """Sigue la clave más larga de una tabla de prefijos (operadores o geocoder) dígito a dígito"""
+
+    def __init__(self, data, cc: str, anchor: str, token: str = ""):
+        self.keys = {k for k in data if k.startswith(anchor) or anchor.startswith(k)}
+        self.internal = {k[:i] for k in self.keys for i in range(len(k))}
+        state = (None, "")
+        for digit in cc:
+            state = self._advance(state, digit)
+        self.start = (token,) + state
+
+    def _advance(self, state, digit):
+        deepest, node = state
+        if node is None:
+            return state
+        node += digit
+        if node in self.keys:
+            deepest = node
+        return deepest, (node if node in self.internal else None)
+
+    def step(self, state, digit):
+        pending, deepest, node = state
+        if pending is None or node is None and not pending:
+            return state
+        if pending:
+            # Token móvil (p.ej. el 9 de Argentina) que el geocoder omite
+            return (pending[1:], deepest, node) if digit == pending[0] else (None, None, None)
+        return ("",) + self._advance((deepest, node), digit)
+
+    @staticmethod
+    def deepest(state) -> Optional[str]:
+        return state[1] if state[0] == "" else None
+
+def _split_country_code(digits: str) -> Tuple[str, str]:
+    for size in (1, 2, 3):
+        cc = digits[:size]
+        if cc and int(cc) in COUNTRY_CODE_TO_REGION_CODE:
+            return cc, digits[size:]
+    raise ValueError(f"Código de país desconocido en el prefijo: +{digits}")
+
+def _range_automata(cc: str) -> list:
+    """Patrones de validez/tipo de todas las regiones que comparten el código de país"""
+    automata = []
+    for region in COUNTRY_CODE_TO_REGION_CODE[int(cc)]:
+        metadata = PhoneMetadata.metadata_for_region_or_calling_code(int(cc), region)
+        if metadata is None:
+            continue
+        if metadata.leading_digits:
+            automata.append(_DigitAutomaton(metadata.leading_digits, prefix_match=True))
+        for name in _NUMBER_DESCS:
+            desc = getattr(metadata, name)
+            if desc is not None and desc.national_number_pattern:
+                automata.append(_DigitAutomaton(desc.national_number_pattern))
+    return automata
+
+def analyze_range(prefix: str, length: int) -> RangeReport:
+    """Resume un bloque completo (prefijo + longitud nacional) sin analizar cada número.
+
+    El bloque se recorre dígito a dígito siguiendo a la vez los patrones de validez/tipo de los
+    metadatos y las tablas de prefijos de operador y geocoder. Los dígitos que llevan al mismo
+    estado se agrupan, así que solo se llama a analyze_number una vez por combinación distinta.
+    """
+    t0 = time.perf_counter()
+    digits = "".join(ch for ch in prefix if ch.isdigit())
+    if not digits:
+        raise ValueError("Prefijo vacío")
+    cc, national = _split_country_code(digits)
+    if len(national) > length:
+        raise ValueError(f"El prefijo tiene más de {length} dígitos nacionales")
+
+    automata = _range_automata(cc)
+    walkers = [_PrefixWalker(CARRIER_DATA, cc, digits), _PrefixWalker(GEOCODE_DATA, cc, digits)]
+    token = country_mobile_token(int(cc))
+    if token and (national.startswith(token) or token.startswith(national)):
+        stripped = cc + national[len(token):] if national.startswith(token) else cc
+        walkers.append(_PrefixWalker(GEOCODE_DATA, cc, stripped, token))
+
+    def advance(state, digit):
+        alive, walks = state
+        alive = tuple((i, s) for i, s in ((i, automata[i].step(s, digit)) for i, s in alive) if s != automata[i].dead)
+        return alive, tuple(w.step(ws, digit) for w, ws in zip(walkers, walks))
+
+    memo = {}
+
+    def expand(state, remaining):
+        """Devuelve {firma: [cantidad, sufijo representativo]} para los números bajo `state`"""
+        key = (state, remaining)
+        if key in memo:
+            return memo[key]
+        if remaining == 0:
+            alive, walks = state
+            signature = (
+                frozenset(i for i, s in alive if automata[i].accepts(s)),
+                tuple(_PrefixWalker.deepest(ws) for ws in walks),
+            )
+            result = {signature: [1, ""]}
+        else:
+            groups = {}
+            for digit in DIGITS:
+                groups.setdefault(advance(state, digit), []).append(digit)
+            result = {}
+            for child, group in groups.items():
+                for signature, (count, suffix) in expand(child, remaining - 1).items():
+                    entry = result.get(signature)
+                    if entry is None:
+                        result[signature] = [count * len(group), group[0] + suffix]
+                    else:
+                        entry[0] += count * len(group)
+        memo[key] = result
+        return result
+
+    state = (tuple((i, a.start) for i, a in enumerate(automata)), tuple(w.start for w in walkers))
+    for digit in national:
+        state = advance(state, digit)
+    cells = expand(state, length - len(national))
+
+    grouped = {}
+    for (_, deepest), (count, suffix) in cells.items():
+        keys = [k for k in deepest[:2] if k and len(k) > len(digits)]
+        cell_prefix = max(keys, key=len) if keys else digits
+        try:
+            info = analyze_number("+" + digits + suffix)
+            row_key = (cell_prefix, info.valid, info.number_type, info.carrier, info.description)
+        except ValueError:
+            row_key = (cell_prefix, False, None, None, None)
+        grouped[row_key] = grouped.get(row_key, 0) + count
+
+    rows = [RangeRow(p, count, valid, ntype, carrier, desc)
+            for (p, valid, ntype, carrier, desc), count in sorted(grouped.items(), key=lambda kv: (kv[0][0], -kv[1]))]
+    return RangeReport(
+        prefix=digits,
+        length=length,
+        total=10 ** (length - len(national)),
+        rows=rows,
+        seconds=time.perf_counter() - t0,
+    )
+
+# ============================
+#   GEOLOCALIZACIÓN FINA (descripción -> coordenadas de ciudad)
+# ============================
+# INFOPHONE_GEOCODER: "gazetteer" (por defecto, sin red), "http" o "off"
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gazetteer.json")
+GEOCACHE_PATH = os.path.join(os.path.expanduser("~"), ".infophone_geocache.json")
+GEOCODER_DEFAULT_URL = "http://127.0.0.1:8080/search"
+GEOCODER_MAX_CONCURRENCY = 4
+GEOCODER_MIN_INTERVAL = 1.0  # segundos entre peticiones al servicio HTTP
+GEOCODER_TIMEOUT = 5
+
+# Sufijo de estado al final de la descripción, p.ej. "Recanto das Emas - DF"
+GEO_SUFFIX_RE = re.compile(r"\s+-\s+[A-Z]{2,3}$")
+
+def _geo_key(region: str, description: str) -> str:
+    text = unicodedata.normalize("NFKD", description).encode("ascii", "ignore").decode("ascii")
+    return f"{region}|{' '.join(text.lower().split())}"
+
+class GazetteerBackend:
+    """Nomenclátor local: {región ISO2: {lugar: [lat, lon]}}"""
+
+    def __init__(self, path: str = GAZETTEER_PATH):
+        self.places = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        for region, places in data.items():
+            for name, (lat, lon) in places.items():
+                self.places[_geo_key(region, name)] = (lat, lon)
+
+    def lookup(self, region: str, description: str) -> Optional[Tuple[float, float]]:
+        coords = self.places.get(_geo_key(region, description))
+        if coords is None:
+            # Descripciones tipo "Ciudad, Departamento" o "Ciudad - UF"
+            city = GEO_SUFFIX_RE.sub("", description.split(",")[0])
+            if city != description:
+                coords = self.places.get(_geo_key(region, city))
+        return coords
+
+class HttpGeocodeBackend:
+    """Cliente asíncrono para un servicio tipo Nominatim (/search?q=...&format=json)"""
+
+    def __init__(self, url: str, max_concurrency: int = GEOCODER_MAX_CONCURRENCY,
+                 min_interval: float = GEOCODER_MIN_INTERVAL, timeout: float = GEOCODER_TIMEOUT):
+        self.url = url
+        self.min_interval = min_interval
+        self.timeout = timeout
+        # Conexiones reutilizadas entre peticiones (keep-alive)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="infophone-geocode")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._throttle_lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def _throttle(self):
+        async with self._throttle_lock:
+            loop = asyncio.get_running_loop()
+            wait = self._next_slot - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_slot = loop.time() + self.min_interval
+
+    async def geocode(self, region: str, description: str) -> Optional[Tuple[float, float]]:
+        async with self._semaphore:
+            await self._throttle()
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self._fetch, region, description)
+
+    def _fetch(self, region: str, description: str) -> Optional[Tuple[float, float]]:
+        params = {"q": description, "countrycodes": region.lower(), "format": "json", "limit": 1}
+        response = self.session.get(self.url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            return None
+        return float(results[0]["lat"]), float(results[0]["lon"])
+
+class GeoEnricher:
+    """Resuelve (región, descripción) con nomenclátor local, caché en disco y backend opcional"""
+
+    def __init__(self, gazetteer: GazetteerBackend, backend=None, cache_path: str = GEOCACHE_PATH):
+        self.gazetteer = gazetteer
+        self.backend = backend
+        self.cache_path = cache_path
+        self._pending = {}
+        self._dirty = False
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError):
+            self.cache = {}
+
+    def lookup(self, region: str, description: str) -> Tuple[bool, Optional[Tuple[float, float]]]:
+        """Consulta sin red. Devuelve (resuelto, coordenadas); resuelto=False requiere resolve()"""
+        if not region or not description or description == "Ubicación no disponible":
+            return True, None
+        key = _geo_key(region, description)
+        if key in self.cache:
+            coords = self.cache[key]
+            return True, tuple(coords) if coords else None
+        coords = self.gazetteer.lookup(region, description)
+        if coords or self.backend is None:
+            return True, coords
+        return False, None
+
+    async def resolve(self, region: str, description: str) -> Optional[Tuple[float, float]]:
+        coords = await self._resolve(region, description)
+        self.flush()
+        return coords
+
+    async def resolve_many(self, pairs: Iterable[Tuple[str, str]]) -> list:
+        results = await asyncio.gather(*(self._resolve(region, desc) for region, desc in pairs))
+        self.flush()
+        return results
+
+    async def _resolve(self, region: str, description: str) -> Optional[Tuple[float, float]]:
+        found, coords = self.lookup(region, description)
+        if found:
+            return coords
+        key = _geo_key(region, description)
+        # Una sola petición en vuelo por clave aunque lleguen varios números iguales
+        task = self._pending.get(key)
+        if task is None:
+            task = self._pending[key] = asyncio.ensure_future(self._fetch(key, region, description))
+        return await task
+
+    async def _fetch(self, key: str, region: str, description: str) -> Optional[Tuple[float, float]]:
+        try:
+            coords = await self.backend.geocode(region, description)
+        except Exception:
+            # Fallos de red no se guardan en caché para reintentar más tarde
+            return None
+        finally:
+            self._pending.pop(key, None)
+        self.cache[key] = list(coords) if coords else None
+        self._dirty = True
+        return coords
+
+    def flush(self):
+        if not self._dirty:
+            return
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.cache, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+        except OSError:
+            pass
+
+def build_geo_enricher() -> Optional[GeoEnricher]:
+    mode = os.environ.get("INFOPHONE_GEOCODER", "gazetteer").lower()
+    if mode == "off":
+        return None
+    backend = None
+    if mode == "http":
+        backend = HttpGeocodeBackend(os.environ.get("INFOPHONE_GEOCODER_URL", GEOCODER_DEFAULT_URL))
+    return GeoEnricher(GazetteerBackend(), backend)
+
+class AsyncLoopThread:
+    """Bucle asyncio en un hilo de fondo para no bloquear la UI"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="infophone-async", daemon=True)
+        self.thread.start()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
 # ============================
 #   HTML del MAPA (LEAFLET) - TU VERSION ORIGINAL CORREGIDA
 # ============================
@@ -379,7 +1146,50 @@ class Terminal(QTextEdit):
         self.setFont(f)
 
     def log(self, msg: str):
-        self.append(f"<span style='color:#ff4b6e;'>[InfoPhone Pro]</span> {msg}")
+        html = f"<span style='color:#ff4b6e;'>[InfoPhone Pro]</span> {msg}"
+        with PERF.phase("terminal_log"):
+            self.append(html)
+
+class BatchSignals(QObject):
+    finished = Signal(object)
+    failed = Signal(str)
+
+class BatchTask(QRunnable):
+    """Ejecuta analyze_file fuera del hilo de la UI y devuelve BatchStats por señal"""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self.signals = BatchSignals()
+
+    def run(self):
+        try:
+            stats = analyze_file(self.path)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(stats)
+
+class RangeTask(QRunnable):
+    """Ejecuta analyze_range fuera del hilo de la UI y devuelve RangeReport por señal"""
+
+    def __init__(self, prefix: str, length: int):
+        super().__init__()
+        self.prefix = prefix
+        self.length = length
+        self.signals = BatchSignals()
+
+    def run(self):
+        try:
+            report = analyze_range(self.prefix, self.length)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(report)
+
+class GeoSignals(QObject):
+    # (PhoneInfo, zonas horarias, Future) emitido desde el hilo asyncio
+    resolved = Signal(object)
 
 class InfoPhoneApp(QMainWindow):
     def __init__(self):
@@ -390,6 +1200,13 @@ class InfoPhoneApp(QMainWindow):
         self.setStyleSheet(FRAME_QSS)
         self._map_ready = False
         self.user_location = None
+        self._last_info = None
+
+        # Geolocalización fina opcional (nomenclátor local y, si se configura, HTTP)
+        self.geo = build_geo_enricher()
+        self.geo_runner = AsyncLoopThread() if self.geo and self.geo.backend else None
+        self.geo_signals = GeoSignals()
+        self.geo_signals.resolved.connect(self._on_geo_resolved)
         
         # Obtener ubicación del usuario al inicio
         self.get_user_location()
@@ -466,6 +1283,37 @@ class InfoPhoneApp(QMainWindow):
         copy_act = QAction("Copiar terminal", self)
         copy_act.triggered.connect(self.copy_terminal)
         self.menuBar().addAction(copy_act)
+        self.batch_act = QAction("Analizar archivo", self)
+        self.batch_act.triggered.connect(self.on_analyze_file)
+        self.menuBar().addAction(self.batch_act)
+        self._batch_task = None
+        self.range_act = QAction("Analizar rango", self)
+        self.range_act.triggered.connect(self.on_analyze_range)
+        self.menuBar().addAction(self.range_act)
+        self._range_task = None
+        self.perf_act = QAction("Rendimiento", self, checkable=True)
+        self.perf_act.setChecked(PERF.enabled)
+        self.perf_act.toggled.connect(self.on_toggle_perf)
+        self.menuBar().addAction(self.perf_act)
+        self.profile_act = QAction("Perfil cProfile", self, checkable=True)
+        self.profile_act.toggled.connect(self.on_toggle_profile)
+        self.menuBar().addAction(self.profile_act)
+
+        # Panel de rendimiento (p50/p95 por fase)
+        self.perf_view = QTextEdit()
+        self.perf_view.setReadOnly(True)
+        self.perf_view.setFont(self.terminal.font())
+        self.perf_dock = QDockWidget("Rendimiento", self)
+        self.perf_dock.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable)
+        self.perf_dock.setWidget(self.perf_view)
+        self.perf_dock.setMinimumWidth(320)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.perf_dock)
+        self.perf_dock.setVisible(PERF.enabled)
+        self.perf_timer = QTimer(self)
+        self.perf_timer.setInterval(500)
+        self.perf_timer.timeout.connect(self._refresh_perf)
+        if PERF.enabled:
+            self.perf_timer.start()
 
         self.terminal.log("Bienvenido a InfoPhone Pro. Sistema iniciado correctamente.")
         self.terminal.log("Ubicación del usuario detectada y configurada para análisis avanzado.")
@@ -511,92 +1359,95 @@ class InfoPhoneApp(QMainWindow):
             "typ": typ or "—",
         }
         script = f"window.InfoPhone && window.InfoPhone.update({json.dumps(payload)})"
-        self.web.page().runJavaScript(script)
+        if PERF.enabled:
+            # Ida y vuelta completa: llamada desde Python hasta el callback de WebEngine
+            t0 = time.perf_counter()
+            self.web.page().runJavaScript(script, 0, lambda _result: PERF.record("js_ida_vuelta", time.perf_counter() - t0))
+        else:
+            self.web.page().runJavaScript(script)
 
     def analyze_number(self, raw: str) -> 'PhoneInfo':
-        raw = raw.strip()
-        if not raw:
-            raise ValueError("Número vacío")
-        try:
-            num = phonenumbers.parse(raw, None)
-        except NumberParseException as e:
-            raise ValueError(f"No se pudo interpretar el número: {e}")
-
-        # Análisis completo y detallado
-        is_possible = phonenumbers.is_possible_number(num)
-        is_valid = phonenumbers.is_valid_number(num)
-        valid = is_possible and is_valid
-        
-        # Formatos múltiples
-        e164 = phonenumbers.format_number(num, phonenumbers.PhoneNumberFormat.E164) if valid else None
-        national = phonenumbers.format_number(num, phonenumbers.PhoneNumberFormat.NATIONAL) if valid else None
-        international = phonenumbers.format_number(num, phonenumbers.PhoneNumberFormat.INTERNATIONAL) if valid else None
-        
-        # Información geográfica detallada
-        region = phonenumbers.region_code_for_number(num) or "UNKNOWN"
-        ntype = phonenumbers.number_type(num)
-        number_type_str = TYPE_NAMES.get(ntype, str(ntype))
-        
-        # Operadores múltiples idiomas
-        carrier_es = pn_carrier.name_for_number(num, "es")
-        carrier_en = pn_carrier.name_for_number(num, "en") 
-        carrier = carrier_es or carrier_en or "No disponible"
-        
-        # Descripciones geográficas múltiples
-        desc_es = pn_geocoder.description_for_number(num, "es")
-        desc_en = pn_geocoder.description_for_number(num, "en")
-        description = desc_es or desc_en or "Ubicación no disponible"
-        
-        # Zonas horarias
-        tzs = list(pn_timezone.time_zones_for_number(num)) or []
-
-        # Coordenadas mejoradas
-        centroid = COUNTRY_CENTROIDS.get(region, (0.0, 0.0))
-        
-        return PhoneInfo(
-            raw=raw,
-            e164=e164,
-            region=region,
-            valid=bool(valid),
-            number_type=number_type_str,
-            carrier=carrier,
-            description=description,
-            timezones=tzs,
-            centroid=centroid,
-        )
+        return analyze_number(raw)
 
     def on_analyze(self):
+        with PERF.operation():
+            self._analyze_input()
+
+    def _analyze_input(self):
         raw = self.input.text()
         try:
             info = self.analyze_number(raw)
         except Exception as e:
+            # Una respuesta tardía del geocoder ya no corresponde a lo que se muestra
+            self._last_info = None
             self.terminal.log(f"<span style='color:#ff90a6'>Error:</span> {e}")
             return
 
         # Análisis súper detallado - más de 80 datos
+        with PERF.phase("formato_html"):
+            self._log_report(raw, info)
+
+        # Actualizar mapa con mejor centrado
+        if info.centroid:
+            lat, lon = info.centroid
+        else:
+            lat, lon = self.user_location['lat'], self.user_location['lon']
+
+        tz_str = ', '.join(info.timezones) if info.timezones else 'No disponible'
+        self._last_info = info
+        if self.geo and info.valid:
+            found, coords = self.geo.lookup(info.region, info.description)
+            if coords:
+                lat, lon = coords
+                self.terminal.log(f"<b>Coordenadas refinadas:</b> {lat:.6f}, {lon:.6f} ({info.description})")
+            elif not found and self.geo_runner:
+                # Se resuelve en segundo plano; el marcador se reubica al llegar la respuesta
+                future = self.geo_runner.submit(self.geo.resolve(info.region, info.description))
+                future.add_done_callback(lambda f, info=info, tz_str=tz_str: self.geo_signals.resolved.emit((info, tz_str, f)))
+
+        with PERF.phase("js_update"):
+            self._js_update(info.e164 or info.raw, info.region, info.carrier, info.description, lat, lon, tz_str, info.number_type)
+
+    def _on_geo_resolved(self, payload):
+        info, tz_str, future = payload
+        if info is not self._last_info or future.cancelled() or future.exception():
+            return
+        coords = future.result()
+        if not coords:
+            return
+        lat, lon = coords
+        self.terminal.log(f"<b>Coordenadas refinadas:</b> {lat:.6f}, {lon:.6f} ({info.description})")
+        self._js_update(info.e164 or info.raw, info.region, info.carrier, info.description, lat, lon, tz_str, info.number_type)
+
+    def _log_report(self, raw: str, info: 'PhoneInfo'):
         self.terminal.log(f"<span style='color:#4ade80'>═══ ANÁLISIS COMPLETO INICIADO ═══</span>")
         self.terminal.log(f"<b>Número ingresado:</b> {info.raw}")
         
         try:
-            parsed = phonenumbers.parse(raw)
+            with PERF.phase("parse"):
+                parsed = phonenumbers.parse(raw)
+            with PERF.phase("validacion"):
+                is_possible = phonenumbers.is_possible_number(parsed)
             
             # Información básica
             self.terminal.log(f"<b>Estado:</b> {'✓ VÁLIDO' if info.valid else '✗ INVÁLIDO'}")
-            self.terminal.log(f"<b>Posible:</b> {'Sí' if phonenumbers.is_possible_number(parsed) else 'No'}")
+            self.terminal.log(f"<b>Posible:</b> {'Sí' if is_possible else 'No'}")
             self.terminal.log(f"<b>Código de país:</b> +{parsed.country_code}")
             self.terminal.log(f"<b>Número nacional:</b> {parsed.national_number}")
             
             # Formatos múltiples
             self.terminal.log(f"<b>Formato E.164:</b> {info.e164 or 'No disponible'}")
             if info.valid:
-                nat_format = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.NATIONAL)
-                int_format = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
+                with PERF.phase("validacion"):
+                    nat_format = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.NATIONAL)
+                    int_format = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
                 self.terminal.log(f"<b>Formato Nacional:</b> {nat_format}")
                 self.terminal.log(f"<b>Formato Internacional:</b> {int_format}")
                 
                 # RFC3966 format
                 try:
-                    rfc_format = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.RFC3966)
+                    with PERF.phase("validacion"):
+                        rfc_format = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.RFC3966)
                     self.terminal.log(f"<b>Formato RFC3966:</b> {rfc_format}")
                 except:
                     pass
@@ -628,15 +1479,17 @@ class InfoPhoneApp(QMainWindow):
                 phonenumbers.PhoneNumberType.PREMIUM_RATE: "Tarifa premium - Costo adicional"
             }
             
-            ntype = phonenumbers.number_type(parsed)
+            with PERF.phase("validacion"):
+                ntype = phonenumbers.number_type(parsed)
             if ntype in type_details:
                 self.terminal.log(f"<b>Detalles del tipo:</b> {type_details[ntype]}")
             
             # Información de país
             from phonenumbers import geocoder
-            country_name = geocoder.country_name_for_number(parsed, "es")
-            if not country_name:
-                country_name = geocoder.country_name_for_number(parsed, "en")
+            with PERF.phase("geocoder"):
+                country_name = geocoder.country_name_for_number(parsed, "es")
+                if not country_name:
+                    country_name = geocoder.country_name_for_number(parsed, "en")
             if country_name:
                 self.terminal.log(f"<b>Nombre del país:</b> {country_name}")
             
@@ -682,16 +1535,8 @@ class InfoPhoneApp(QMainWindow):
         except Exception as e:
             self.terminal.log(f"<span style='color:#ff90a6'>Error en análisis avanzado:</span> {e}")
 
-        # Actualizar mapa con mejor centrado
-        if info.centroid:
-            lat, lon = info.centroid
-        else:
-            lat, lon = self.user_location['lat'], self.user_location['lon']
-
-        tz_str = ', '.join(info.timezones) if info.timezones else 'No disponible'
-        self._js_update(info.e164 or info.raw, info.region, info.carrier, info.description, lat, lon, tz_str, info.number_type)
-
     def on_clear(self):
+        self._last_info = None
         self.terminal.clear()
         self.terminal.log("Sistema reiniciado. Listo para nuevo análisis.")
         self.input.clear()
@@ -717,6 +1562,113 @@ class InfoPhoneApp(QMainWindow):
         self.terminal.log(f"Exportado: {txt_path}")
         QMessageBox.information(self, APP_TITLE, f"Exportado a: {txt_path}")
 
+    def on_analyze_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Analizar archivo", "", "Texto (*.txt *.csv);;Todos (*)")
+        if not path:
+            return
+
+        self.terminal.log(f"Analizando archivo por lotes: {path}")
+        self.batch_act.setEnabled(False)
+        self._batch_task = BatchTask(path)
+        self._batch_task.signals.finished.connect(self._on_batch_finished)
+        self._batch_task.signals.failed.connect(self._on_batch_failed)
+        QThreadPool.globalInstance().start(self._batch_task)
+
+    def _on_batch_failed(self, error: str):
+        self._batch_task = None
+        self.batch_act.setEnabled(True)
+        self.terminal.log(f"<span style='color:#ff90a6'>Error en lote:</span> {error}")
+
+    def _on_batch_finished(self, stats: 'BatchStats'):
+        self._batch_task = None
+        self.batch_act.setEnabled(True)
+        self.terminal.log(f"<span style='color:#4ade80'>═══ LOTE COMPLETADO ═══</span>")
+        self.terminal.log(f"<b>Números procesados:</b> {stats.numbers} ({stats.valid} válidos, {stats.invalid} inválidos, {stats.errors} errores)")
+        self.terminal.log(f"<b>Tiempo:</b> {stats.seconds:.2f} s")
+        self.terminal.log(f"<b>Rendimiento:</b> {stats.numbers_per_sec:,.0f} números/s | {stats.bytes_per_sec / (1024 * 1024):,.2f} MB/s")
+        if stats.regions:
+            top = ', '.join(f"{r}: {n}" for r, n in stats.regions.most_common(10))
+            self.terminal.log(f"<b>Regiones principales:</b> {top}")
+        if stats.types:
+            tipos = ', '.join(f"{t}: {n}" for t, n in stats.types.most_common())
+            self.terminal.log(f"<b>Tipos de línea:</b> {tipos}")
+
+    def on_analyze_range(self):
+        prefix = self.input.text().strip()
+        if not prefix:
+            QMessageBox.information(self, APP_TITLE, "Ingresa un prefijo, p.ej. +57 300, en el campo de número.")
+            return
+
+        length, ok = QInputDialog.getInt(self, "Analizar rango", f"Dígitos nacionales de los números de {prefix}:", 10, 1, 17)
+        if not ok:
+            return
+
+        self.terminal.log(f"Analizando rango {prefix} ({length} dígitos)...")
+        self.range_act.setEnabled(False)
+        self._range_task = RangeTask(prefix, length)
+        self._range_task.signals.finished.connect(self._on_range_finished)
+        self._range_task.signals.failed.connect(self._on_range_failed)
+        QThreadPool.globalInstance().start(self._range_task)
+
+    def _on_range_failed(self, error: str):
+        self._range_task = None
+        self.range_act.setEnabled(True)
+        self.terminal.log(f"<span style='color:#ff90a6'>Error en rango:</span> {error}")
+
+    def _on_range_finished(self, report: 'RangeReport'):
+        self._range_task = None
+        self.range_act.setEnabled(True)
+        length = report.length
+        self.terminal.log(f"<span style='color:#4ade80'>═══ RANGO +{report.prefix} ({length} dígitos) ═══</span>")
+        self.terminal.log(f"<b>Números en el bloque:</b> {report.total:,} | <b>Prefijos evaluados:</b> {len(report.rows)} | <b>Tiempo:</b> {report.seconds:.2f} s")
+        for row in report.rows[:RANGE_MAX_LOG_ROWS]:
+            estado = '✓' if row.valid else '✗'
+            self.terminal.log(
+                f"<b>+{row.prefix}</b> {row.count:,} {estado} {row.number_type or '—'} | "
+                f"{row.carrier or '—'} | {row.description or '—'}"
+            )
+        if len(report.rows) > RANGE_MAX_LOG_ROWS:
+            self.terminal.log(f"... {len(report.rows) - RANGE_MAX_LOG_ROWS} prefijos más")
+        for ntype, count in report.by_type().most_common():
+            self.terminal.log(f"<b>Total {ntype or 'INVÁLIDO'}:</b> {count:,} ({count * 100 / report.total:.2f}%)")
+        for carrier, count in report.by_carrier().most_common():
+            self.terminal.log(f"<b>Total {carrier or '—'}:</b> {count:,} ({count * 100 / report.total:.2f}%)")
+
+    def on_toggle_perf(self, on: bool):
+        PERF.enabled = on
+        self.perf_dock.setVisible(on)
+        if on:
+            PERF.reset()
+            self.perf_timer.start()
+            self._refresh_perf()
+        else:
+            self.perf_timer.stop()
+
+    def _refresh_perf(self):
+        rows = PERF.percentiles()
+        if not rows:
+            self.perf_view.setPlainText("Sin muestras todavía. Analiza un número.")
+            return
+        lines = [f"{'FASE':<14}{'N':>6}{'p50 ms':>10}{'p95 ms':>10}"]
+        for name, count, p50, p95 in rows:
+            lines.append(f"{name:<14}{count:>6}{p50:>10.3f}{p95:>10.3f}")
+        self.perf_view.setPlainText("\n".join(lines))
+
+    def on_toggle_profile(self, on: bool):
+        if on:
+            PERF.start_profile()
+            self.terminal.log("cProfile activo. Vuelve a pulsar \"Perfil cProfile\" para guardar el perfil.")
+            return
+
+        path, _ = QFileDialog.getSaveFileName(self, "Guardar perfil", "infophone_perfil.prof", "pstats (*.prof)")
+        if path and not path.endswith('.prof'):
+            path += '.prof'
+        PERF.stop_profile(path or None)
+        if path:
+            self.terminal.log(f"Perfil guardado: {path}")
+        else:
+            self.terminal.log("cProfile detenido sin guardar.")
+
     def copy_terminal(self):
         self.terminal.selectAll()
         self.terminal.copy()
@@ -0,0 +1,14 @@
+import os
+import sys
+import types
+
+# La lógica de análisis no necesita WebEngine; en máquinas sin librerías X
+# (CI, servidores) su import falla, así que se sustituye por un módulo mínimo.
+try:
+    import PySide6.QtWebEngineWidgets  # noqa: F401
+except ImportError:
+    stub = types.ModuleType("PySide6.QtWebEngineWidgets")
+    stub.QWebEngineView = object
+    sys.modules["PySide6.QtWebEngineWidgets"] = stub
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
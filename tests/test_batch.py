@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+import InfoPhone
+
+LINES = [
+    "+573001234567", "", "+12125550123", "basura", "   ",
+    "+442071838750", "+5491123456789", "", "+34915551234",
+]
+
+
+def _summary(stats):
+    return (stats.numbers, stats.valid, stats.invalid, stats.errors, stats.regions, stats.types)
+
+
+@pytest.fixture
+def dump(tmp_path):
+    # Fin de línea CRLF, líneas vacías y sin salto de línea final
+    path = tmp_path / "numeros.txt"
+    path.write_bytes("\r\n".join(LINES * 20).encode("utf-8"))
+    return str(path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("chunk_bytes", [1, 7, 1000, 10 ** 9])
+def test_analyze_file_matches_analyze_batch(dump, workers, chunk_bytes):
+    expected = InfoPhone.analyze_batch(LINES * 20)
+    stats = InfoPhone.analyze_file(dump, workers=workers, chunk_bytes=chunk_bytes)
+
+    assert _summary(stats) == _summary(expected)
+    assert stats.bytes == os.path.getsize(dump)
+
+
+def test_chunk_offsets_cover_file_on_line_boundaries(dump):
+    with open(dump, "rb") as f:
+        data = f.read()
+    for chunk_bytes in (1, 7, 1000):
+        offsets = InfoPhone.chunk_offsets(data, chunk_bytes)
+        assert offsets[0][0] == 0 and offsets[-1][1] == len(data)
+        for (_, end), (start, _) in zip(offsets, offsets[1:]):
+            assert end == start and data[end - 1:end] == b"\n"
+
+
+def test_analyze_file_empty(tmp_path):
+    path = tmp_path / "vacio.txt"
+    path.write_bytes(b"")
+    stats = InfoPhone.analyze_file(str(path))
+    assert stats.numbers == 0 and stats.bytes == 0
@@ -0,0 +1,84 @@
+import asyncio
+import json
+from collections import Counter
+
+import InfoPhone
+
+
+class FakeBackend:
+    """Backend asíncrono de prueba: cuenta peticiones por clave y puede fallar"""
+
+    def __init__(self, results=None, failing=()):
+        self.results = results or {}
+        self.failing = set(failing)
+        self.calls = Counter()
+
+    async def geocode(self, region, description):
+        self.calls[(region, description)] += 1
+        await asyncio.sleep(0.01)
+        if description in self.failing:
+            raise OSError("servicio no disponible")
+        return self.results.get(description)
+
+
+def _gazetteer(tmp_path, places):
+    path = tmp_path / "gazetteer.json"
+    path.write_text(json.dumps(places), encoding="utf-8")
+    return InfoPhone.GazetteerBackend(str(path))
+
+
+def test_gazetteer_matches_city_suffixes(tmp_path):
+    gazetteer = _gazetteer(tmp_path, {
+        "BR": {"São Paulo": [-23.55, -46.63]},
+        "US": {"New York": [40.71, -74.0]},
+        "MX": {"Guadalajara": [20.66, -103.35]},
+    })
+    assert gazetteer.lookup("BR", "São Paulo - SP") == (-23.55, -46.63)
+    assert gazetteer.lookup("BR", "sao paulo") == (-23.55, -46.63)
+    assert gazetteer.lookup("US", "New York, NY") == (40.71, -74.0)
+    assert gazetteer.lookup("MX", "Guadalajara, JAL") == (20.66, -103.35)
+    assert gazetteer.lookup("BR", "Campinas - SP") is None
+    assert gazetteer.lookup("US", "São Paulo - SP") is None
+
+
+def test_bundled_gazetteer_loads():
+    gazetteer = InfoPhone.GazetteerBackend()
+    assert gazetteer.lookup("CO", "Bogotá") is not None
+    assert gazetteer.lookup("BR", "Salvador - BA") is not None
+
+
+def test_enricher_shares_in_flight_request_and_caches(tmp_path):
+    backend = FakeBackend({"Chía": (4.86, -74.06)})
+    cache_path = str(tmp_path / "cache.json")
+    enricher = InfoPhone.GeoEnricher(_gazetteer(tmp_path, {}), backend, cache_path)
+
+    results = asyncio.run(enricher.resolve_many([("CO", "Chía")] * 5 + [("CO", "Nada")]))
+
+    assert results == [(4.86, -74.06)] * 5 + [None]
+    assert backend.calls == Counter({("CO", "Chía"): 1, ("CO", "Nada"): 1})
+    # Aciertos y respuestas vacías quedan en caché, también en disco
+    assert enricher.lookup("CO", "chia") == (True, (4.86, -74.06))
+    assert enricher.lookup("CO", "Nada") == (True, None)
+    reloaded = InfoPhone.GeoEnricher(_gazetteer(tmp_path, {}), FakeBackend(), cache_path)
+    assert reloaded.lookup("CO", "Chía") == (True, (4.86, -74.06))
+
+
+def test_enricher_does_not_cache_failures(tmp_path):
+    backend = FakeBackend(failing={"Chía"})
+    enricher = InfoPhone.GeoEnricher(_gazetteer(tmp_path, {}), backend, str(tmp_path / "cache.json"))
+
+    assert asyncio.run(enricher.resolve("CO", "Chía")) is None
+    assert enricher.lookup("CO", "Chía") == (False, None)
+    assert asyncio.run(enricher.resolve("CO", "Chía")) is None
+    assert backend.calls[("CO", "Chía")] == 2
+    assert not (tmp_path / "cache.json").exists()
+
+
+def test_enricher_prefers_gazetteer_over_backend(tmp_path):
+    backend = FakeBackend({"Bogotá": (0.0, 0.0)})
+    gazetteer = _gazetteer(tmp_path, {"CO": {"Bogotá": [4.71, -74.07]}})
+    enricher = InfoPhone.GeoEnricher(gazetteer, backend, str(tmp_path / "cache.json"))
+
+    assert enricher.lookup("CO", "Bogotá") == (True, (4.71, -74.07))
+    assert asyncio.run(enricher.resolve("CO", "Bogotá")) == (4.71, -74.07)
+    assert not backend.calls
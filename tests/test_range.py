@@ -0,0 +1,53 @@
+import itertools
+from collections import Counter
+
+import pytest
+
+import InfoPhone
+
+
+def _brute_force(prefix: str, length: int) -> Counter:
+    digits = "".join(ch for ch in prefix if ch.isdigit())
+    _, national = InfoPhone._split_country_code(digits)
+    counts = Counter()
+    for suffix in itertools.product("0123456789", repeat=length - len(national)):
+        try:
+            info = InfoPhone.analyze_number("+" + digits + "".join(suffix))
+        except ValueError:
+            counts[(False, None, None, None)] += 1
+            continue
+        counts[(info.valid, info.number_type, info.carrier, info.description)] += 1
+    return counts
+
+
+def _report_counts(report: "InfoPhone.RangeReport") -> Counter:
+    counts = Counter()
+    for row in report.rows:
+        counts[(row.valid, row.number_type, row.carrier, row.description)] += row.count
+    return counts
+
+
+@pytest.mark.parametrize("prefix, length", [
+    ("+1 212 55", 10),   # NANPA: centrales que empiezan por 0/1 son inválidas
+    ("+57 300", 7),      # móvil colombiano con operador
+    ("+44 20 7", 6),     # longitud que no casa con todos los patrones
+    ("+54 9 11 2345", 11),  # token móvil argentino en el geocoder
+])
+def test_analyze_range_matches_brute_force(prefix, length):
+    report = InfoPhone.analyze_range(prefix, length)
+    assert sum(row.count for row in report.rows) == report.total
+    assert _report_counts(report) == _brute_force(prefix, length)
+
+
+def test_analyze_range_splits_invalid_exchanges():
+    report = InfoPhone.analyze_range("+1 212", 10)
+    by_type = report.by_type()
+    assert report.total == 10 ** 7
+    # Centrales 0xx y 1xx (20 %) no son válidas; el resto sí
+    assert by_type[None] == 2 * 10 ** 6
+    assert sum(by_type.values()) == report.total
+
+
+def test_analyze_range_rejects_unknown_country_code():
+    with pytest.raises(ValueError):
+        InfoPhone.analyze_range("+999", 6)